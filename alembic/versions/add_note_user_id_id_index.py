@@ -0,0 +1,21 @@
+"""replace note.user_id index with (user_id, id)
+
+Revision ID: 5d2e7b19c4a0
+Revises: 0a5f9cb02389
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+revision = '5d2e7b19c4a0'
+down_revision = '0a5f9cb02389'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_note_user_id_id', 'note', ['user_id', 'id'])
+    op.drop_index('ix_note_user_id', table_name='note')
+
+def downgrade() -> None:
+    op.create_index('ix_note_user_id', 'note', ['user_id'])
+    op.drop_index('ix_note_user_id_id', table_name='note')
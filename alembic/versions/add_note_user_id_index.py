@@ -0,0 +1,19 @@
+"""add index on note.user_id
+
+Revision ID: 8a85d113bc72
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+revision = '8a85d113bc72'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_note_user_id', 'note', ['user_id'])
+
+def downgrade() -> None:
+    op.drop_index('ix_note_user_id', table_name='note')
@@ -0,0 +1,28 @@
+"""server-side defaults for created_at/updated_at
+
+Revision ID: 0a5f9cb02389
+Revises: 8a85d113bc72
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0a5f9cb02389'
+down_revision = '8a85d113bc72'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.func.now())
+    with op.batch_alter_table('note') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.func.now())
+        batch_op.alter_column('updated_at', server_default=sa.func.now())
+
+def downgrade() -> None:
+    with op.batch_alter_table('note') as batch_op:
+        batch_op.alter_column('updated_at', server_default=None)
+        batch_op.alter_column('created_at', server_default=None)
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('created_at', server_default=None)
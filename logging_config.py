@@ -4,31 +4,50 @@ Provides JSON logs for production and pretty logs for development.
 """
 import structlog
 import logging
+import orjson
 import sys
 from typing import Any
 
-def configure_logging(json_logs: bool = True) -> None:
+
+def _orjson_dumps(value: Any, **kwargs: Any) -> str:
+    """Serialize log events with orjson; unknown types fall back to str()."""
+    return orjson.dumps(value, default=str).decode()
+
+
+def configure_logging(json_logs: bool = True, log_level: str = "INFO") -> None:
     """
     Configure structlog for the application.
     
     Args:
         json_logs: If True, output JSON format (production).
                    If False, output human-readable format (development).
+        log_level: Minimum level to emit. Calls below it return immediately
+                   without running any processors.
+    
+    Raises:
+        ValueError: If log_level is not a standard logging level name.
     """
+    level = logging.getLevelName(log_level.upper())
+    # Unknown names come back as the string "Level X" rather than raising
+    if not isinstance(level, int):
+        raise ValueError(
+            f"Invalid LOG_LEVEL {log_level!r}; expected one of "
+            "DEBUG, INFO, WARNING, ERROR or CRITICAL"
+        )
+    
     # Shared processors for all configurations
     shared_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
     ]
     
     if json_logs:
         # Production: JSON formatted logs
         processors = shared_processors + [
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
         ]
     else:
         # Development: Pretty colored logs
@@ -39,7 +58,7 @@ def configure_logging(json_logs: bool = True) -> None:
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
@@ -49,7 +68,7 @@ def configure_logging(json_logs: bool = True) -> None:
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=logging.INFO,
+        level=level,
     )
 
 
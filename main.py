@@ -1,39 +1,73 @@
-from typing import Optional, List
-from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from typing import Annotated, Optional, List
+from contextlib import asynccontextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import anyio
+import asyncio
+import base64
+import bcrypt
+import hashlib
+import hmac
+import itertools
+import threading
+import time
 import jwt
-from sqlmodel import SQLModel, Field, select, create_engine, Session, Relationship
-from fastapi import FastAPI, Depends, HTTPException, Request
+import orjson
+from cachetools import TTLCache
+from sqlmodel import SQLModel, Field, select, Relationship
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Index, Text, bindparam, cast, event, func, insert, literal, or_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from fastapi import FastAPI, Body, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, field_validator, EmailStr
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, StringConstraints, TypeAdapter, EmailStr
 from ai_service import generate_summary
 import os
 from logging_config import configure_logging, get_logger
 
 
 # ===== PASSWORD HASHING =====
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is called directly; hashes stay compatible with the old passlib ones
+BCRYPT_ROUNDS = 12
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+# bcrypt is CPU-bound (and releases the GIL), so it gets one worker per core
+# instead of queueing in the default threadpool behind blocking OpenAI calls
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+async def run_bcrypt(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, func, *args)
 
 # ===== JWT CONFIGURATION =====
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Algorithm and key are fixed, so the header segment and key bytes are built
+# once; each token only encodes its claims and signs them (HS256 = HMAC-SHA256).
+# Output is byte-for-byte what jwt.encode produces; decoding still uses PyJWT.
+_JWT_HEADER_SEGMENT = _b64url(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    # Integer epoch seconds - what PyJWT would convert a datetime to anyway
+    to_encode["exp"] = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    signing_input = _JWT_HEADER_SEGMENT + b"." + _b64url(orjson.dumps(to_encode))
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
 
 def verify_token(token: str) -> dict:
     try:
@@ -44,26 +78,99 @@ def verify_token(token: str) -> dict:
     except jwt.JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# ===== TOKEN CACHE =====
+# Repeat callers skip jwt.decode and the user lookup for a short while.
+# Entries are only stored for tokens that outlive the TTL, so a cached
+# token can never be accepted after it has expired.
+TOKEN_CACHE_TTL_SECONDS = min(30, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_token_cache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+# ===== LOGIN CACHE =====
+# Identical logins within a few seconds (client retries, re-auth) reuse the
+# previous bcrypt result. Only successful logins are cached, so an entry can
+# only be created by someone who already knew the password.
+LOGIN_CACHE_TTL_SECONDS = 5
+_login_cache = TTLCache(maxsize=1000, ttl=LOGIN_CACHE_TTL_SECONDS)
+_login_cache_lock = threading.Lock()
+
+def _login_cache_key(username: str, password: str) -> bytes:
+    # NUL separator keeps ("a:b", "c") and ("a", "b:c") apart
+    return hashlib.sha256(username.encode() + b"\0" + password.encode()).digest()
+
+# ===== NOTES LIST CACHE =====
+# Serialized GET /notes pages, keyed by the user's notes version plus the
+# query params. Every write moves the user to a new version, so this worker
+# never serves a page older than its own last write; the short TTL bounds
+# how stale a page can be after a write handled by another worker.
+# The cache is bounded by total page size, not entry count - note content
+# has no length limit and callers choose the query params.
+NOTES_CACHE_TTL_SECONDS = 5
+NOTES_CACHE_MAX_BYTES = int(os.getenv("NOTES_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+_notes_cache = TTLCache(maxsize=NOTES_CACHE_MAX_BYTES, ttl=NOTES_CACHE_TTL_SECONDS, getsizeof=len)
+# Versions come from one global counter, so a user whose entry expired or
+# was evicted gets a number no cached page can carry
+_notes_versions = TTLCache(maxsize=100_000, ttl=NOTES_CACHE_TTL_SECONDS * 2)
+_notes_version_counter = itertools.count(1)
+_notes_cache_lock = threading.Lock()
+
+def invalidate_notes_cache(user_id: int) -> None:
+    with _notes_cache_lock:
+        _notes_versions[user_id] = next(_notes_version_counter)
+
+def _notes_cache_version(user_id: int) -> int:
+    # Caller holds _notes_cache_lock
+    version = _notes_versions.get(user_id)
+    if version is None:
+        version = _notes_versions[user_id] = next(_notes_version_counter)
+    return version
+
+def _store_notes_page(cache_key: tuple, page) -> None:
+    # A single page bigger than the whole budget is just not cached
+    if len(page) <= NOTES_CACHE_MAX_BYTES:
+        with _notes_cache_lock:
+            _notes_cache[cache_key] = page
+
 
 # ===== DATABASE MODELS =====
+# Timestamps are filled in by the database. eager_defaults makes the ORM read
+# them back with RETURNING on the same INSERT/UPDATE instead of a reload.
 class User(SQLModel, table=True):
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(unique=True, index=True)
     email: str = Field(unique=True, index=True)
     hashed_password: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(
+        default=None, nullable=False, sa_column_kwargs={"server_default": func.now()}
+    )
     
     # Relationship
     notes: List["Note"] = Relationship(back_populates="owner")
 
 class Note(SQLModel, table=True):
+    __mapper_args__ = {"eager_defaults": True}
+    # Note listings filter on user_id and page by id, so (user_id, id) serves
+    # both straight from the index. It also covers plain user_id lookups.
+    __table_args__ = (Index("ix_note_user_id_id", "user_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     content: str
     is_completed: bool = False
     tags: Optional[str] = Field(default=None)
     ai_summary: Optional[str] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(
+        default=None, nullable=False, sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
     
     # Foreign key - links note to user
     user_id: int = Field(foreign_key="user.id")
@@ -72,22 +179,71 @@ class Note(SQLModel, table=True):
     owner: User = Relationship(back_populates="notes")
 
 
+# Auth lookups are built once at import and executed with params, so only
+# the bound values change per request
+user_by_username_query = select(User).where(User.username == bindparam("username"))
+# Only the username column is fetched - enough to tell which field collided,
+# without hydrating a User or transferring its password hash
+user_collision_query = select(User.username).where(
+    or_(User.username == bindparam("username"), User.email == bindparam("email"))
+)
+
+# Serializes note lists straight to JSON bytes in pydantic-core, without
+# re-validating each row the way response_model=List[Note] would
+note_list_adapter = TypeAdapter(List[Note])
+
+# One page of a user's notes; built once and executed with params
+notes_page_query = (
+    select(Note)
+    .where(Note.user_id == bindparam("user_id"), Note.id > bindparam("after_id"))
+    .order_by(Note.id)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+def as_json_array_query(page_query):
+    """
+    PostgreSQL only: wrap a page query so the database itself aggregates the
+    rows into a JSON array, and rows never become ORM objects on the way out.
+    """
+    page = page_query.subquery("n")
+    return select(
+        func.coalesce(
+            cast(func.json_agg(aggregate_order_by(page.table_valued(), page.c.id)), Text),
+            "[]",
+        )
+    )
+
+notes_page_json_query = as_json_array_query(notes_page_query)
+
+def filter_notes_query(query, completed: Optional[bool], tag: Optional[str]):
+    """
+    Narrow a page query in SQL so LIMIT applies to matching rows only.
+    tags is stored comma-separated ("work, ideas"); a tag matches one whole
+    entry of that list, ignoring the space after each comma. tag is expected
+    already stripped.
+    """
+    if completed is not None:
+        query = query.where(Note.is_completed == completed)
+    if tag:
+        tag_list = literal(",") + func.replace(Note.tags, ", ", ",") + ","
+        query = query.where(tag_list.contains(f",{tag},", autoescape=True))
+    return query
+
+
 # ===== PYDANTIC MODEL (for API input validation) =====
+# Rejects empty and whitespace-only strings inside pydantic-core (no Python
+# validator call) while keeping the value exactly as sent
+NonBlankStr = Annotated[str, StringConstraints(pattern=r"\S")]
+
 class NoteCreate(BaseModel):
-    content: str
+    content: NonBlankStr
     is_completed: bool = False
     tags: Optional[str] = None
-    
-    @field_validator('content')
-    @classmethod
-    def content_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError('Content cannot be empty')
-        return v
 
 # ===== USER SCHEMAS =====
 class UserCreate(BaseModel):
-    username: str
+    username: NonBlankStr
     email: EmailStr
     password: str
 
@@ -107,54 +263,178 @@ class UserResponse(BaseModel):
 # Dynamic database URL (PostgreSQL in Docker, SQLite for local testing)
 database_url = os.getenv("DATABASE_URL", "sqlite:///database.db")
 
-# Create engine with connection pooling
-# pool_pre_ping=True checks connection health before using
-engine = create_engine(
-    database_url,
-    echo=True,
-    pool_pre_ping=True,
-    connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {}
+def get_async_url(url: str) -> str:
+    """
+    Swap the sync driver in a database URL for its asyncio counterpart.
+    DATABASE_URL stays in sync form because Alembic still uses it as-is.
+    """
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+# Pool sized for concurrent load instead of SQLAlchemy's 5 + 10 default.
+# pool_recycle keeps connections younger than PostgreSQL/proxy idle timeouts.
+# pool_timeout bounds how long a request waits for a free connection.
+# SQLite keeps the dialect's default pool - these knobs don't apply to it.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600"))
+
+is_sqlite = database_url.startswith("sqlite")
+
+pool_options = {} if is_sqlite else {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+}
+
+# SQL echo formats and writes every statement on the hot path - opt-in only
+sql_echo = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+# Create async engine with connection pooling
+# pool_pre_ping checks connection health before using - skipped for SQLite,
+# where a local file connection can't go stale and the ping is a wasted query
+engine = create_async_engine(
+    get_async_url(database_url),
+    echo=sql_echo,
+    pool_pre_ping=not is_sqlite,
+    **pool_options,
 )
 
+# WAL lets readers proceed while a write is in progress, and
+# synchronous=NORMAL drops the fsync on every commit (WAL stays consistent).
+# mmap and a 20 MB page cache keep hot pages out of read() syscalls;
+# busy_timeout makes a blocked writer wait instead of failing immediately.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-20000",
+    "busy_timeout=5000",
+)
+
+if is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    # SQLite only optimizes tables the closing connection itself queried, so
+    # this runs per connection as the pool closes it (engine.dispose() at
+    # shutdown, recycle, invalidation) rather than once on a fresh one
+    @event.listens_for(engine.sync_engine, "close")
+    def optimize_sqlite_on_close(dbapi_connection, connection_record):
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA optimize")
+            cursor.close()
+        except Exception as exc:
+            # Stats are an optimization - a busy or broken connection still closes
+            logger.warning("sqlite_optimize_failed", exc_message=str(exc))
+
+
+# A checkpoint normally runs only when the WAL reaches 1000 pages, and
+# never truncates the file; TRUNCATE on a timer keeps it small for readers
+SQLITE_CHECKPOINT_INTERVAL_SECONDS = int(os.getenv("SQLITE_CHECKPOINT_INTERVAL_SECONDS", "300"))
+
+async def checkpoint_sqlite_wal():
+    while True:
+        await asyncio.sleep(SQLITE_CHECKPOINT_INTERVAL_SECONDS)
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as exc:
+            # A busy database just means the next run checkpoints instead
+            logger.warning("sqlite_checkpoint_failed", exc_message=str(exc))
+
 
 # 2. CREATE TABLES
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
 
 
 # 3. THE DEPENDENCY
-def get_session():
-    with Session(engine) as session:
+# Session options are bound once here rather than on every request.
+# expire_on_commit=False: expired attributes would need a lazy load,
+# which AsyncSession cannot do implicitly
+async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# Stays a generator: FastAPI runs the code after yield once the response is
+# sent, which is what returns the connection to the pool
+async def get_session():
+    async with async_session_factory() as session:
         yield session
 
 security = HTTPBearer()
 
 # ===== AUTHENTICATION DEPENDENCY =====
-def get_current_user(
+# FastAPI caches dependencies per request, so this shares the endpoint's
+# Depends(get_session) - one session and one pool checkout per request.
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> User:
     token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    with _token_cache_lock:
+        cached_user = _token_cache.get(cache_key)
+    if cached_user is not None:
+        # Detached copy - the cached row must not be tied to a closed session
+        return User(**cached_user)
+
     payload = verify_token(token)
     user_id = payload.get("user_id")
     
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
+    if payload.get("exp", 0) > time.time() + TOKEN_CACHE_TTL_SECONDS:
+        with _token_cache_lock:
+            _token_cache[cache_key] = user.model_dump()
+    
     return user
 
 
 # 4. INITIALIZE APP
+# Local/SQLite runs create missing tables on startup. Deployments that run
+# `alembic upgrade head` turn this off so startup does no DDL reflection.
+create_tables_on_startup = os.getenv("CREATE_TABLES_ON_STARTUP", "true").lower() == "true"
+
+# Handlers are async, but the blocking OpenAI client still runs through
+# run_in_threadpool. anyio caps that pool at 40 threads, which a couple of
+# concurrent bulk requests exhaust; the threads mostly wait on the network.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "200"))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    # The limiter belongs to the running event loop, so it is set here
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if create_tables_on_startup:
+        await create_db_and_tables()
+    checkpoint_task = asyncio.create_task(checkpoint_sqlite_wal()) if is_sqlite else None
+    logger.info("application_startup", status="success", database="connected")
     yield
+    if is_sqlite:
+        checkpoint_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await checkpoint_task
+    # Close pooled connections (SQLite runs PRAGMA optimize on each as it
+    # closes); aiosqlite's worker threads otherwise keep the process alive
+    await engine.dispose()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -165,11 +445,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    logger.info("application_startup", status="success", database="connected")
-
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Catch all unhandled exceptions and log them."""
@@ -179,32 +454,30 @@ async def global_exception_handler(request: Request, exc: Exception):
                 path=request.url.path,
                 method=request.method)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
 # ===== AUTHENTICATION ENDPOINTS =====
 @app.post("/register", response_model=UserResponse, status_code=201)
-def register(user_data: UserCreate, session: Session = Depends(get_session)):
+async def register(user_data: UserCreate, session: AsyncSession = Depends(get_session)):
     logger.info("user_registration_attempt", email=user_data.email, username=user_data.username)
     
-    # Check if username exists
-    existing_user = session.exec(
-        select(User).where(User.username == user_data.username)
-    ).first()
-    if existing_user:
+    # Check username and email in one round-trip. Both columns are unique,
+    # so at most two rows can match.
+    taken_usernames = (await session.exec(
+        user_collision_query,
+        params={"username": user_data.username, "email": user_data.email},
+    )).all()
+    if user_data.username in taken_usernames:
         logger.warning("user_registration_failed", 
                       email=user_data.email, 
                       username=user_data.username,
                       reason="username_already_exists")
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    # Check if email exists
-    existing_email = session.exec(
-        select(User).where(User.email == user_data.email)
-    ).first()
-    if existing_email:
+    if taken_usernames:
         logger.warning("user_registration_failed",
                       email=user_data.email,
                       username=user_data.username,
@@ -212,7 +485,7 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
         raise HTTPException(status_code=400, detail="Email already exists")
 
     # Create user with hashed password
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await run_bcrypt(hash_password, user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -220,8 +493,7 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
     )
 
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
     
     logger.info("user_registration_success",
                user_id=new_user.id,
@@ -231,13 +503,24 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
     return new_user
 
 @app.post("/login", response_model=Token)
-def login(user_data: UserLogin, session: Session = Depends(get_session)):
+async def login(user_data: UserLogin, session: AsyncSession = Depends(get_session)):
     logger.info("user_login_attempt", username=user_data.username)
     
+    login_key = _login_cache_key(user_data.username, user_data.password)
+    with _login_cache_lock:
+        cached_user_id = _login_cache.get(login_key)
+    if cached_user_id is not None:
+        access_token = create_access_token({"user_id": cached_user_id})
+        logger.info("user_login_success",
+                   user_id=cached_user_id,
+                   username=user_data.username,
+                   cached=True)
+        return {"access_token": access_token, "token_type": "bearer"}
+    
     # Find user by username
-    user = session.exec(
-        select(User).where(User.username == user_data.username)
-    ).first()
+    user = (await session.exec(
+        user_by_username_query, params={"username": user_data.username}
+    )).first()
 
     # Check if user exists
     if not user:
@@ -250,7 +533,7 @@ def login(user_data: UserLogin, session: Session = Depends(get_session)):
         )
     
     # Verify password
-    if not verify_password(user_data.password, user.hashed_password):
+    if not await run_bcrypt(verify_password, user_data.password, user.hashed_password):
         logger.warning("user_login_failed",
                       username=user_data.username,
                       user_id=user.id,
@@ -260,6 +543,9 @@ def login(user_data: UserLogin, session: Session = Depends(get_session)):
             detail="Incorrect username or password"
         )
 
+    with _login_cache_lock:
+        _login_cache[login_key] = user.id
+
     # Create JWT token
     access_token = create_access_token({"user_id": user.id})
     
@@ -270,21 +556,24 @@ def login(user_data: UserLogin, session: Session = Depends(get_session)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/notes", response_model=Note, status_code=201)
-def create_note(
+async def create_note(
     note_input: NoteCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    logger.info("note_creation_attempt", 
-               user_id=current_user.id, 
-               content_length=len(note_input.content))
+    logger.debug("note_creation_attempt", 
+                user_id=current_user.id, 
+                content_length=len(note_input.content))
     
     # Create note and link it to the current user
     note = Note(**note_input.model_dump(), user_id=current_user.id)
-    note.ai_summary = generate_summary(note.content, user_id=current_user.id)
+    # The OpenAI client is blocking - keep it off the event loop
+    note.ai_summary = await run_in_threadpool(generate_summary, note.content, user_id=current_user.id)
     session.add(note)
-    session.commit()
-    session.refresh(note)
+    # No refresh: eager_defaults returns id and timestamps from the INSERT,
+    # and expire_on_commit=False keeps them loaded after the commit
+    await session.commit()
+    invalidate_notes_cache(current_user.id)
     
     logger.info("note_creation_success",
                note_id=note.id,
@@ -293,32 +582,101 @@ def create_note(
     
     return note
 
-@app.get("/notes")
-def get_notes(
+# Caps one bulk request: every note still gets its own AI summary call
+MAX_BULK_NOTES = 100
+
+@app.post("/notes/bulk", status_code=201)
+async def create_notes_bulk(
+    notes_input: List[NoteCreate] = Body(..., min_length=1, max_length=MAX_BULK_NOTES),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    logger.info("notes_retrieval_attempt", user_id=current_user.id)
+    logger.debug("note_bulk_creation_attempt",
+                user_id=current_user.id,
+                notes_count=len(notes_input))
     
-    # Only return notes belonging to the current user
-    statement = select(Note).where(Note.user_id == current_user.id)
-    notes = session.exec(statement).all()
+    # Summaries run concurrently in the threadpool instead of one after another
+    summaries = await asyncio.gather(*(
+        run_in_threadpool(generate_summary, note_input.content, user_id=current_user.id)
+        for note_input in notes_input
+    ))
+    rows = [
+        {**note_input.model_dump(), "ai_summary": summary, "user_id": current_user.id}
+        for note_input, summary in zip(notes_input, summaries)
+    ]
+
+    # One executemany INSERT and one commit for the whole batch. Rows skip ORM
+    # object construction; ids and timestamps come from the database.
+    await session.exec(insert(Note.__table__), params=rows)
+    await session.commit()
+    invalidate_notes_cache(current_user.id)
     
-    logger.info("notes_retrieval_success",
+    logger.info("note_bulk_creation_success",
                user_id=current_user.id,
-               notes_count=len(notes))
+               notes_count=len(rows))
+    
+    return {"created": len(rows)}
+
+@app.get("/notes", response_model=List[Note])
+async def get_notes(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    after_id: int = Query(0, ge=0),
+    completed: Optional[bool] = None,
+    tag: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    logger.debug("notes_retrieval_attempt", user_id=current_user.id)
+    
+    # Normalized once so a blank tag means "no filter" everywhere below
+    tag = (tag or "").strip() or None
+    with _notes_cache_lock:
+        cache_key = (current_user.id, _notes_cache_version(current_user.id),
+                     limit, offset, after_id, completed, tag)
+        cached_page = _notes_cache.get(cache_key)
+    if cached_page is not None:
+        logger.debug("notes_retrieval_success", user_id=current_user.id, cached=True)
+        return Response(content=cached_page, media_type="application/json")
+
+    page_params = {"user_id": current_user.id, "after_id": after_id,
+                   "limit": limit, "offset": offset}
+
+    # Unfiltered listings reuse the prebuilt queries as-is
+    filtered = completed is not None or tag is not None
+    page_query = filter_notes_query(notes_page_query, completed, tag) if filtered else notes_page_query
+
+    if session.bind.dialect.name == "postgresql":
+        json_query = as_json_array_query(page_query) if filtered else notes_page_json_query
+        notes_json = (await session.exec(json_query, params=page_params)).one()
+        _store_notes_page(cache_key, notes_json)
+        logger.debug("notes_retrieval_success", user_id=current_user.id)
+        return Response(content=notes_json, media_type="application/json")
+
+    # Only return notes belonging to the current user, one page at a time.
+    # after_id (the last id of the previous page) lets the database seek
+    # straight to the next page instead of scanning past `offset` rows.
+    notes = (await session.exec(page_query, params=page_params)).all()
+    
+    logger.debug("notes_retrieval_success",
+                user_id=current_user.id,
+                notes_count=len(notes))
     
-    return notes
+    # response_model above documents the shape; returning a Response skips
+    # FastAPI's per-row validation and serialization
+    notes_json = note_list_adapter.dump_json(notes)
+    _store_notes_page(cache_key, notes_json)
+    return Response(content=notes_json, media_type="application/json")
 
 @app.get("/notes/{note_id}", response_model=Note)
-def get_note(
+async def get_note(
     note_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    logger.info("note_retrieval_attempt", note_id=note_id, user_id=current_user.id)
+    logger.debug("note_retrieval_attempt", note_id=note_id, user_id=current_user.id)
     
-    note = session.get(Note, note_id)
+    note = await session.get(Note, note_id)
 
     # Check if note exists
     if not note:
@@ -337,20 +695,20 @@ def get_note(
                       reason="unauthorized_access_attempt")
         raise HTTPException(status_code=403, detail="Not authorized to access this note")
 
-    logger.info("note_retrieval_success", note_id=note_id, user_id=current_user.id)
+    logger.debug("note_retrieval_success", note_id=note_id, user_id=current_user.id)
     return note
 
 @app.put("/notes/{note_id}", response_model=Note)
-def update_note(
+async def update_note(
     note_id: int,
     note_update: NoteCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    logger.info("note_update_attempt", note_id=note_id, user_id=current_user.id)
+    logger.debug("note_update_attempt", note_id=note_id, user_id=current_user.id)
     
     # Get the note
-    note = session.get(Note, note_id)
+    note = await session.get(Note, note_id)
 
     # Check if note exists
     if not note:
@@ -375,8 +733,8 @@ def update_note(
     note.tags = note_update.tags
 
     session.add(note)
-    session.commit()
-    session.refresh(note)
+    await session.commit()
+    invalidate_notes_cache(current_user.id)
     
     logger.info("note_update_success",
                note_id=note.id,
@@ -386,15 +744,15 @@ def update_note(
     return note
 
 @app.delete("/notes/{note_id}")
-def delete_note(
+async def delete_note(
     note_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    logger.info("note_deletion_attempt", note_id=note_id, user_id=current_user.id)
+    logger.debug("note_deletion_attempt", note_id=note_id, user_id=current_user.id)
     
     # Get the note
-    note = session.get(Note, note_id)
+    note = await session.get(Note, note_id)
 
     # Check if note exists
     if not note:
@@ -414,8 +772,9 @@ def delete_note(
         raise HTTPException(status_code=403, detail="Not authorized to delete this note")
 
     # Delete the note
-    session.delete(note)
-    session.commit()
+    await session.delete(note)
+    await session.commit()
+    invalidate_notes_cache(current_user.id)
     
     logger.info("note_deletion_success",
                note_id=note_id,
@@ -424,5 +783,6 @@ def delete_note(
     return {"message": "Note deleted successfully", "id": note_id}
 
 json_logs = os.getenv("JSON_LOGS", "true").lower() == "true"
-configure_logging(json_logs=json_logs)
+log_level = os.getenv("LOG_LEVEL", "INFO")
+configure_logging(json_logs=json_logs, log_level=log_level)
 logger = get_logger(__name__)
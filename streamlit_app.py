@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 
 API_URL = "http://localhost:8000"
+NOTES_PAGE_SIZE = 200
 
 st.set_page_config(page_title="BrainDump", page_icon="🧠", layout="centered")
 
@@ -26,8 +27,18 @@ def register(username, email, password):
     return r
 
 def get_notes():
-    r = requests.get(f"{API_URL}/notes", headers=auth_headers())
-    return r.json() if r.status_code == 200 else []
+    # GET /notes is paginated - walk the pages to show every note
+    notes = []
+    while True:
+        after_id = notes[-1]["id"] if notes else 0
+        r = requests.get(f"{API_URL}/notes", headers=auth_headers(),
+                         params={"limit": NOTES_PAGE_SIZE, "after_id": after_id})
+        if r.status_code != 200:
+            return notes
+        page = r.json()
+        notes.extend(page)
+        if len(page) < NOTES_PAGE_SIZE:
+            return notes
 
 def create_note(content, tags):
     r = requests.post(f"{API_URL}/notes", headers=auth_headers(),
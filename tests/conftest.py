@@ -1,40 +1,75 @@
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.testclient import TestClient
 import pytest
-from sqlalchemy.pool import StaticPool
-from main import app, get_session, User, hash_password
+import uuid
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from main import app, get_session, get_async_url, User, hash_password, _token_cache, _login_cache, _notes_cache
 
-TEST_DB_URL = "sqlite://"
+@pytest.fixture(name="db_url", scope="session")
+def db_url_fixture():
+    """
+    Named in-memory SQLite database in shared-cache mode. Tests seed data
+    through a sync Session while the app opens its own connections to the
+    same database through an AsyncSession. The unique name keeps pytest-xdist
+    workers isolated from each other.
+    """
+    return f"sqlite:///file:test-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
 
-@pytest.fixture(name="session")
-def session_fixture():
-    engine = create_engine(
-        TEST_DB_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool
-    )
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture(db_url: str):
+    """Create the schema once for the whole run."""
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
     SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(name="async_engine", scope="session")
+def async_engine_fixture(db_url: str):
+    # NullPool: TestClient may run each request on a fresh event loop,
+    # so connections must not be reused across requests
+    return create_async_engine(get_async_url(db_url), poolclass=NullPool)
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
     with Session(engine) as session:
         yield session
-    SQLModel.metadata.drop_all(engine)
+    # The app commits on its own connections, so a wrapping transaction can't
+    # roll its writes back - empty the tables instead (DML only, no DDL)
+    with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            conn.execute(table.delete())
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
+def client_fixture(session: Session, async_engine):
+    async def get_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
     
     app.dependency_overrides[get_session] = get_session_override
+    _token_cache.clear()
+    _login_cache.clear()
+    _notes_cache.clear()
+    # Not entered with `with`: the app lifespan (create_all against
+    # DATABASE_URL, engine.dispose) is skipped, so tests never touch the real
+    # database. Use `with TestClient(app)` in a test that needs startup.
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
 
+@pytest.fixture(name="test_password_hash", scope="session")
+def test_password_hash_fixture():
+    """bcrypt is deliberately slow - hash the test password once per run."""
+    return hash_password("testpass123")
+
 @pytest.fixture(name="test_user")
-def test_user_fixture(session: Session):
+def test_user_fixture(session: Session, test_password_hash: str):
     """Create a test user in the database."""
     user = User(
         username="testuser",
         email="test@example.com",
-        hashed_password=hash_password("testpass123")
+        hashed_password=test_password_hash
     )
     session.add(user)
     session.commit()
@@ -0,0 +1,91 @@
+import jwt
+import main
+from fastapi.testclient import TestClient
+
+
+def test_token_cache_skips_decode_on_repeat(client: TestClient, auth_headers: dict, mocker):
+    """Repeat requests with the same token should only decode it once."""
+    decode_spy = mocker.spy(jwt, "decode")
+
+    first = client.get("/notes", headers=auth_headers)
+    second = client.get("/notes", headers=auth_headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert decode_spy.call_count == 1
+
+
+def test_register_duplicate_username(client: TestClient, test_user):
+    """Registering an existing username returns 400."""
+    response = client.post(
+        "/register",
+        json={"username": "testuser", "email": "new@example.com", "password": "pw123456"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already exists"
+
+
+def test_register_duplicate_email(client: TestClient, test_user):
+    """Registering an existing email returns 400."""
+    response = client.post(
+        "/register",
+        json={"username": "newuser", "email": "test@example.com", "password": "pw123456"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already exists"
+
+
+def test_repeat_login_skips_password_check(client: TestClient, test_user, mocker):
+    """An identical login within the cache window should not re-run bcrypt."""
+    verify_spy = mocker.spy(main, "verify_password")
+    credentials = {"username": "testuser", "password": "testpass123"}
+
+    first = client.post("/login", json=credentials)
+    second = client.post("/login", json=credentials)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert verify_spy.call_count == 1
+
+
+def test_login_cache_does_not_accept_wrong_password(client: TestClient, test_user):
+    """A cached successful login must not let a different password through."""
+    client.post("/login", json={"username": "testuser", "password": "testpass123"})
+
+    response = client.post("/login", json={"username": "testuser", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_authenticated_request_opens_one_session(client: TestClient, auth_headers: dict):
+    """get_current_user and the endpoint should share a single session."""
+    open_session = main.app.dependency_overrides[main.get_session]
+    opened = []
+
+    async def counting_session():
+        opened.append(1)
+        async for session in open_session():
+            yield session
+
+    main.app.dependency_overrides[main.get_session] = counting_session
+    response = client.post("/notes", json={"content": "One session"}, headers=auth_headers)
+
+    assert response.status_code == 201
+    assert len(opened) == 1
+
+
+def test_register_blank_username(client: TestClient):
+    """A whitespace-only username is rejected with 422."""
+    response = client.post(
+        "/register",
+        json={"username": "   ", "email": "blank@example.com", "password": "pw123456"}
+    )
+    assert response.status_code == 422
+
+
+def test_access_token_matches_pyjwt():
+    """Hand-signed tokens must be identical to what PyJWT would issue."""
+    token = main.create_access_token({"user_id": 42})
+    payload = jwt.decode(token, main.SECRET_KEY, algorithms=[main.ALGORITHM])
+
+    assert payload["user_id"] == 42
+    assert token == jwt.encode(payload, main.SECRET_KEY, algorithm=main.ALGORITHM)
@@ -16,6 +16,7 @@ def test_create_note_success(client: TestClient, auth_headers: dict):
     assert data["content"] == "New Note"
     assert "id" in data
     assert "user_id" in data
+    assert data["created_at"] is not None
 
 def test_create_note_unauthorized(client: TestClient):
     """Test that creating a note without auth token returns 401."""
@@ -30,6 +31,8 @@ def test_create_note_unauthorized(client: TestClient):
     {"is_completed": False},
     # Case 3: Empty String (Business Logic)
     {"content": "", "is_completed": False},
+    # Case 4: Whitespace Only (Business Logic)
+    {"content": "   ", "is_completed": False},
 ])
 def test_create_note_validation_errors(client: TestClient, auth_headers: dict, payload):
     """
@@ -44,3 +47,30 @@ def test_create_note_validation_errors(client: TestClient, auth_headers: dict, p
     assert response.status_code == 422
     # Optional: verify error response has proper structure
     assert "detail" in response.json()
+
+def test_create_notes_bulk(client: TestClient, auth_headers: dict):
+    """Test that POST /notes/bulk stores every note in one request."""
+    payload = [
+        {"content": "Bulk one", "is_completed": False},
+        {"content": "Bulk two", "is_completed": True, "tags": "bulk"},
+    ]
+    response = client.post("/notes/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+    assert response.json() == {"created": 2}
+
+    notes = client.get("/notes", headers=auth_headers).json()
+    assert [n["content"] for n in notes] == ["Bulk one", "Bulk two"]
+    assert all(n["ai_summary"] == "This is a mocked AI summary." for n in notes)
+
+@pytest.mark.parametrize("payload", [
+    # Case 1: Empty batch
+    [],
+    # Case 2: One invalid note fails the whole batch
+    [{"content": "Valid"}, {"content": ""}],
+    # Case 3: Over the batch size limit
+    [{"content": "Note"}] * 101,
+])
+def test_create_notes_bulk_validation_errors(client: TestClient, auth_headers: dict, payload):
+    """Test that invalid bulk payloads return 422."""
+    response = client.post("/notes/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 422
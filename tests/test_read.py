@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from sqlmodel import Session
+import main
 from main import Note
 
 def test_read_notes_empty(client: TestClient, auth_headers: dict):
@@ -53,3 +54,85 @@ def test_read_notes_unauthorized(client: TestClient):
     """Test that reading notes without auth token returns 403."""
     response = client.get("/notes")
     assert response.status_code == 401
+
+def test_read_notes_paginated(session: Session, client: TestClient, test_user, auth_headers: dict):
+    """Test that limit/offset return one page of notes in creation order."""
+    for i in range(5):
+        session.add(Note(content=f"Note {i}", is_completed=False, user_id=test_user.id))
+    session.commit()
+
+    response = client.get("/notes?limit=2&offset=2", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [n["content"] for n in response.json()] == ["Note 2", "Note 3"]
+
+def test_read_notes_limit_too_large(client: TestClient, auth_headers: dict):
+    """Test that a limit above the maximum page size returns 422."""
+    response = client.get("/notes?limit=1000", headers=auth_headers)
+    assert response.status_code == 422
+
+def test_read_notes_after_id(session: Session, client: TestClient, test_user, auth_headers: dict):
+    """Test that after_id returns the notes following the given id."""
+    notes = [Note(content=f"Note {i}", is_completed=False, user_id=test_user.id) for i in range(4)]
+    session.add_all(notes)
+    session.commit()
+
+    response = client.get(f"/notes?after_id={notes[1].id}&limit=10", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [n["content"] for n in response.json()] == ["Note 2", "Note 3"]
+
+def test_read_notes_filtered(session: Session, client: TestClient, test_user, auth_headers: dict):
+    """Test that completed/tag filters are applied before the page limit."""
+    session.add(Note(content="Done work", is_completed=True, tags="work, ideas", user_id=test_user.id))
+    session.add(Note(content="Open work", is_completed=False, tags="work", user_id=test_user.id))
+    session.add(Note(content="Homework", is_completed=True, tags="homework", user_id=test_user.id))
+    session.add(Note(content="Untagged", is_completed=False, user_id=test_user.id))
+    session.commit()
+
+    completed = client.get("/notes?completed=true&limit=1", headers=auth_headers)
+    tagged = client.get("/notes?tag=work", headers=auth_headers)
+    both = client.get("/notes?tag=work&completed=false", headers=auth_headers)
+
+    assert [n["content"] for n in completed.json()] == ["Done work"]
+    assert [n["content"] for n in tagged.json()] == ["Done work", "Open work"]
+    assert [n["content"] for n in both.json()] == ["Open work"]
+
+    # A blank tag is no filter at all; surrounding spaces are ignored
+    blank = client.get("/notes?tag=%20", headers=auth_headers)
+    padded = client.get("/notes?tag=%20ideas%20", headers=auth_headers)
+    assert len(blank.json()) == 4
+    assert [n["content"] for n in padded.json()] == ["Done work"]
+
+def test_read_notes_cached_until_write(session: Session, client: TestClient, test_user, auth_headers: dict):
+    """Test that a repeat listing is served from cache and a write invalidates it."""
+    assert client.get("/notes", headers=auth_headers).json() == []
+
+    # Written behind the API's back, so the cached page is still served
+    session.add(Note(content="Direct", is_completed=False, user_id=test_user.id))
+    session.commit()
+    assert client.get("/notes", headers=auth_headers).json() == []
+
+    client.post("/notes", json={"content": "Via API"}, headers=auth_headers)
+    response = client.get("/notes", headers=auth_headers)
+    assert [n["content"] for n in response.json()] == ["Direct", "Via API"]
+
+def test_read_notes_cache_survives_version_eviction(session: Session, client: TestClient, test_user, auth_headers: dict):
+    """Test that losing a user's cache version never revives an older page."""
+    assert client.get("/notes", headers=auth_headers).json() == []
+
+    session.add(Note(content="Direct", is_completed=False, user_id=test_user.id))
+    session.commit()
+    main._notes_versions.clear()
+
+    response = client.get("/notes", headers=auth_headers)
+    assert [n["content"] for n in response.json()] == ["Direct"]
+
+def test_read_notes_page_over_cache_budget_not_cached(session: Session, client: TestClient, test_user, auth_headers: dict, monkeypatch):
+    """Test that a page larger than the byte budget is served but not stored."""
+    monkeypatch.setattr(main, "NOTES_CACHE_MAX_BYTES", 10)
+    session.add(Note(content="Longer than ten bytes", is_completed=False, user_id=test_user.id))
+    session.commit()
+
+    assert len(client.get("/notes", headers=auth_headers).json()) == 1
+    assert len(main._notes_cache) == 0
@@ -26,6 +26,9 @@ def test_update_note_success(client: TestClient, auth_headers: dict):
     assert data["content"] == "Updated content!"
     assert data["is_completed"] == True
     assert data["tags"] == "updated"
+    # Timestamps come back on the UPDATE itself, without a reload
+    assert data["created_at"] == create_resp.json()["created_at"]
+    assert data["updated_at"] is not None
 
 
 def test_update_note_not_found(client: TestClient, auth_headers: dict):